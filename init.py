@@ -2,14 +2,15 @@
 import subprocess
 import sys
 import os
-import platform
 import sqlite3
 import logging
 from pathlib import Path
-from dotenv import load_dotenv
-from typing import Optional
 import hashlib
+import importlib.metadata
 import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -19,64 +20,77 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = Path(__file__).parent.resolve()
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# Schema applied by init_database. Every statement is idempotent so it also upgrades existing databases.
+# reg_number uniqueness comes from the idx_reg_number unique index rather than a column constraint; init_database
+# builds it, after removing any duplicates, so databases created before it existed end up with the same schema.
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    salt BLOB
+);
+CREATE TABLE IF NOT EXISTS regulations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    reg_number TEXT NOT NULL,
+    title TEXT,
+    text TEXT,
+    full_text_xml_url TEXT,
+    effective_date TEXT,
+    agency TEXT
+);
+-- (agency, effective_date) serves both per-agency lookups and per-agency date ranges.
+CREATE INDEX IF NOT EXISTS idx_reg_agency_date ON regulations(agency, effective_date);
+CREATE INDEX IF NOT EXISTS idx_reg_effdate ON regulations(effective_date);
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    stripe_subscription_id TEXT,
+    status TEXT,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+-- users.username is UNIQUE and already indexed. idx_sub_user is for future per-user subscription lookups.
+CREATE INDEX IF NOT EXISTS idx_sub_user ON subscriptions(user_id);
+-- LLM responses keyed by a hash of the model and prompt; see src/llm_cache.py.
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
 
-class AltDOGEInitializer:
-    def __init__(self):
-        self.project_dir = Path(__file__).parent
-        self.db_path = self.project_dir / "altDOGE.db"
-        self.env_path = self.project_dir / ".env"
-        self.requirements_path = self.project_dir / "requirements.txt"
-        self.prompts_path = self.project_dir / "prompt_strategies.json"
-        self.python_version = "3.12.3"
-        self.src_dir = self.project_dir / "src"
-        self.pages_dir = self.project_dir / "pages"
-
-    def create_prompt_strategies_file(self) -> bool:
-        """Creates the prompt_strategies.json file with default content."""
-        try:
-            if self.prompts_path.exists():
-                logger.info(f"{self.prompts_path.name} already exists, skipping creation.")
-                return True
-
-            strategies = {
-                "DOGE Criteria": [
-                    "Analyze the following regulation text and categorize as Statutorily Required (SR), Not Statutorily Required (NSR), or Not Required but Agency Needs (NRAN). Provide a detailed justification citing statutory provisions if applicable:\n{text}",
-                    "Evaluate the following regulation for potential reform actions (deletion, simplification, harmonization, modernization). Suggest specific changes with justifications:\n{text}",
-                    "Identify any outdated terminology or processes in the following regulation and propose modernized alternatives:\n{text}",
-                    "Assess the clarity of the following regulation and suggest rephrasing to reduce ambiguity:\n{text}"
-                ],
-                "Statutory Alignment": [
-                    "Statutory Alignment: Ensure the regulation fully implements the statutory requirements and intent, addressing all mandated objectives without omission.\n{text}",
-                    "Clarity and Accessibility: Enhance the regulation’s language and structure to make it clear, concise, and understandable to the general public.\n{text}",
-                    "Outcome: Evaluate whether the regulation achieves its intended outcomes. Include assessment of public sentiment.\n{text}",
-                    "Adaptability to Modern Contexts: Identify opportunities to update the regulation so that the effective scope of the legislation fully adapts to t current technological, economic, and social conditions.\n{text}"
-                ]
-            }
-            with open(self.prompts_path, "w", encoding="utf-8") as f:
-                json.dump(strategies, f, indent=2)
-            logger.info(f"{self.prompts_path.name} created successfully.")
-            return True
-        except Exception as e:
-            logger.error(f"Error creating {self.prompts_path.name}: {e}")
-            return False
-
-    def create_repository_structure(self) -> bool:
-        """Create the repository structure with necessary directories and files."""
-        try:
-            # Create directories
-            self.src_dir.mkdir(exist_ok=True)
-            self.pages_dir.mkdir(exist_ok=True)
-
-            # Create __init__.py in src
-            (self.src_dir / "__init__.py").touch(exist_ok=True)
-
-            # --- Create functional Streamlit page files ---
-            page_contents = {
-                "1_Ingest_Data.py": """
+# Columns added after their tables were first created. CREATE TABLE IF NOT EXISTS leaves older tables alone, so
+# init_database adds any that are missing. Keep these and llm_cache in step with Database.ADDED_COLUMNS and
+# Database.ADDED_TABLES, which the app re-checks at startup.
+_ADDED_COLUMNS = (
+    ("users", "salt", "BLOB"),
+    ("regulations", "full_text_xml_url", "TEXT"),
+)
+
+# Written to prompt_strategies.json on first initialization.
+_DEFAULT_PROMPT_STRATEGIES = {
+    "DOGE Criteria": [
+        "Analyze the following regulation text and categorize as Statutorily Required (SR), Not Statutorily Required (NSR), or Not Required but Agency Needs (NRAN). Provide a detailed justification citing statutory provisions if applicable:\n{text}",
+        "Evaluate the following regulation for potential reform actions (deletion, simplification, harmonization, modernization). Suggest specific changes with justifications:\n{text}",
+        "Identify any outdated terminology or processes in the following regulation and propose modernized alternatives:\n{text}",
+        "Assess the clarity of the following regulation and suggest rephrasing to reduce ambiguity:\n{text}"
+    ],
+    "Statutory Alignment": [
+        "Statutory Alignment: Ensure the regulation fully implements the statutory requirements and intent, addressing all mandated objectives without omission.\n{text}",
+        "Clarity and Accessibility: Enhance the regulation’s language and structure to make it clear, concise, and understandable to the general public.\n{text}",
+        "Outcome: Evaluate whether the regulation achieves its intended outcomes. Include assessment of public sentiment.\n{text}",
+        "Adaptability to Modern Contexts: Identify opportunities to update the regulation so that the effective scope of the legislation fully adapts to t current technological, economic, and social conditions.\n{text}"
+    ]
+}
+
+# Files written by create_repository_structure, encoded once at import rather than on every call.
+_PAGE_CONTENTS = {
+    "1_Ingest_Data.py": """
 import streamlit as st
 import logging
+import time
 from datetime import datetime
-import json
+import orjson
 
 logger = logging.getLogger(__name__)
 st.set_page_config(page_title="Ingest Data - AltDOGE", layout="wide")
@@ -92,14 +106,19 @@ if "user_id" not in st.session_state or st.session_state.user_id is None:
     st.page_link("run_altDOGE.py", label="Go to Login", icon="🏠")
     st.stop()
 
+# The agency list changes rarely; build the dropdown options once an hour for all sessions rather than on
+# every rerun. A failed fetch is not kept, so the next session tries again.
+@st.cache_resource(ttl=3600)
+def load_agency_options(_ingestion_manager) -> dict:
+    return {agency['name']: agency['slug'] for agency in _ingestion_manager.agencies}
+
 st.title("Ingest Federal Register Data")
 start_date = st.text_input("Start Date (YYYY-MM-DD)", "2025-07-01")
 end_date = st.text_input("End Date (YYYY-MM-DD)", "2025-07-31")
 
 # --- Agency Dropdown ---
-all_agencies = runner.ingestion_manager.agencies
-if all_agencies:
-    agency_options = {agency['name']: agency['slug'] for agency in all_agencies}
+agency_options = load_agency_options(runner.ingestion_manager)
+if agency_options:
     agency_names = ["All Agencies"] + list(agency_options.keys())
     selected_agency_name = st.selectbox(
         "Select an Agency (optional)",
@@ -108,6 +127,7 @@ if all_agencies:
     )
     agency_slug = agency_options.get(selected_agency_name)
 else:
+    load_agency_options.clear()
     st.warning("Could not fetch agency list. Please enter agency slug manually.")
     agency_slug = st.text_input("Agency Slug (e.g., securities-and-exchange-commission)", "")
 
@@ -118,7 +138,14 @@ llm_call_limit = st.number_input("Total LLM Call Limit", min_value=1, value=4, h
 
 if st.button("Start Ingestion"):
     progress_bar = st.progress(0, text="Starting ingestion...")
+    last_progress_update = [0.0]
+
     def streamlit_progress_callback(current, total, message):
+        # Every update is a message to the browser; send at most ten a second, but always the final one.
+        now = time.monotonic()
+        if now - last_progress_update[0] < 0.1 and current != total:
+            return
+        last_progress_update[0] = now
         if total > 0:
             progress_bar.progress(current / total, text=message)
         else:
@@ -133,20 +160,21 @@ if st.button("Start Ingestion"):
 
     if result["status"] == "success":
         st.success(f"Processed {len(result['results'])} documents")
+        if result.get("unsaved_documents"):
+            st.warning(f"{len(result['unsaved_documents'])} analyzed documents could not be saved to the database "
+                       f"and won't appear in stored regulations: {', '.join(result['unsaved_documents'])}. "
+                       "See the log for details.")
         output_file = runner.output_dir / f"analysis_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, "w") as f:
-            json.dump(result["results"], f, indent=2)
+        output_file.write_bytes(orjson.dumps(result["results"], option=orjson.OPT_INDENT_2))
         st.write(f"Results saved to {output_file}")
         st.info("You can now view the results on the 'View Ingestion Results' page.")
         st.json(result["results"][:5])
     else:
         st.error(f"Ingestion failed: {result['message']}")
 """,
-                "2_View_Results.py": """
+    "2_View_Results.py": """
 import streamlit as st
 import logging
-import json
-import os
 
 logger = logging.getLogger(__name__)
 st.set_page_config(page_title="View Results - AltDOGE", layout="wide")
@@ -162,16 +190,26 @@ if "user_id" not in st.session_state or st.session_state.user_id is None:
     st.page_link("run_altDOGE.py", label="Go to Login", icon="🏠")
     st.stop()
 
+# Imported past the login checks, so visits that are turned away never load pandas.
+import orjson
+from src.summary import list_results_files
+
+# Every widget interaction reruns the page; parse each results file once per modification rather than per rerun.
+# cache_resource returns the parsed list itself instead of a copy, and it is only read below.
+@st.cache_resource(max_entries=8)
+def load_results_file(path: str, mtime_ns: int) -> list:
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
 st.header("View Ingestion Results")
 try:
-    result_files = sorted(runner.output_dir.glob("analysis_results_*.json"), key=os.path.getmtime, reverse=True)
+    result_files = list_results_files(runner.output_dir)
     if not result_files:
         st.warning("No result files found. Please run an ingestion first.")
     else:
         selected_file = st.selectbox("Select a result file to view:", options=result_files, format_func=lambda p: p.name)
         if selected_file:
-            with open(selected_file, "r", encoding='utf-8') as f:
-                results_data = json.load(f)
+            results_data = load_results_file(str(selected_file), selected_file.stat().st_mtime_ns)
             st.write(f"Displaying results from `{selected_file.name}`")
             st.write(f"Total documents analyzed: {len(results_data)}")
             for doc_result in results_data:
@@ -188,7 +226,7 @@ except Exception as e:
     st.error(f"An error occurred while reading result files: {e}")
     logger.error(f"Error reading result files: {e}", exc_info=True)
 """,
-                "3_Analyze_Regulation.py": """
+    "3_Analyze_Regulation.py": """
 import streamlit as st
 import logging
 
@@ -210,64 +248,25 @@ st.title("Analyze a Specific Regulation by ID")
 prompt_strategies = runner.ingestion_manager.prompt_strategies.keys()
 selected_strategy = st.selectbox("Select Prompt Strategy", options=list(prompt_strategies))
 reg_id = st.number_input("Regulation ID from Database", min_value=1, step=1)
+use_cache = not st.checkbox("Re-run prompts instead of reusing cached responses",
+                            help="Cached responses expire after a week. Re-running refreshes the cache.")
 if st.button("Analyze"):
     with st.spinner(f"Analyzing regulation {reg_id} with '{selected_strategy}' strategy..."):
-        result = runner.ingestion_manager.analyze_regulation(reg_id, prompt_strategy_name=selected_strategy)
+        result = runner.ingestion_manager.analyze_regulation(reg_id, prompt_strategy_name=selected_strategy,
+                                                             use_cache=use_cache)
         if "error" not in result:
             st.success("Analysis complete")
             st.json(result)
         else:
             st.error(f"Analysis failed: {result['error']}")
 """,
-                "4_Review_Summary.py": """
+    "4_Review_Summary.py": """
 import streamlit as st
-import pandas as pd
 import logging
-import json
-import os
-from pathlib import Path
 
 logger = logging.getLogger(__name__)
 st.set_page_config(page_title="Review Summary - AltDOGE", layout="wide")
 
-@st.cache_data
-def load_all_results(output_dir: Path) -> pd.DataFrame:
-    all_results = []
-    result_files = sorted(output_dir.glob("analysis_results_*.json"), key=os.path.getmtime, reverse=True)
-    for file_path in result_files:
-        try:
-            with open(file_path, "r", encoding='utf-8') as f:
-                data = json.load(f)
-                all_results.extend(data)
-        except Exception as e:
-            logger.error(f"Could not read file {file_path}: {e}")
-    return pd.DataFrame(all_results) if all_results else pd.DataFrame()
-
-def create_summary_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return pd.DataFrame()
-    processed_rows = []
-    for _, row in df.iterrows():
-        meta_analysis = row.get('meta_analysis', {})
-        if not isinstance(meta_analysis, dict):
-            meta_analysis = {}
-        bullet_summary_list = meta_analysis.get('bullet_summary', [])
-        if isinstance(bullet_summary_list, list):
-            bullet_summary = "\\n".join(f"- {item}" for item in bullet_summary_list)
-        else:
-            bullet_summary = "Summary not available."
-        new_row = {
-            'document_number': row.get('document_number'),
-            'title': row.get('title'),
-            'agency': row.get('agency'),
-            'Strategy': row.get('prompt_strategy_name', 'Unknown'),
-            'Recommended Action': meta_analysis.get('recommended_action', 'N/A'),
-            'Goal Alignment': meta_analysis.get('goal_alignment', 'N/A'),
-            'Summary': bullet_summary
-        }
-        processed_rows.append(new_row)
-    return pd.DataFrame(processed_rows)
-
 if "runner" not in st.session_state:
     st.error("Application not initialized. Please return to the main page.")
     st.page_link("run_altDOGE.py", label="Go to Home", icon="🏠")
@@ -279,21 +278,23 @@ if "user_id" not in st.session_state or st.session_state.user_id is None:
     st.page_link("run_altDOGE.py", label="Go to Login", icon="🏠")
     st.stop()
 
+# Imported past the login checks, so visits that are turned away never load pandas.
+from src.summary import load_all_results, load_summary, results_fingerprint
+
 st.title("Review Summary of All Ingestions")
-raw_df = load_all_results(runner.output_dir)
+fingerprint = results_fingerprint(runner.output_dir)
+unique_df, total_results = load_all_results(runner.output_dir, fingerprint)
 
-if raw_df.empty:
+if unique_df.empty:
     st.warning("No result files found in the output directory. Please run an ingestion first.")
     st.stop()
 
-total_results = len(raw_df)
-unique_df = raw_df.drop_duplicates(subset=['document_number'], keep='last').copy()
 unique_results = len(unique_df)
 
 st.metric("Total Results Analyzed (All Runs)", total_results)
 st.metric("Unique Regulations Analyzed", unique_results)
 
-processed_df = create_summary_dataframe(unique_df)
+processed_df = load_summary(runner.output_dir, fingerprint)
 
 st.subheader("Summary by Regulation")
 
@@ -314,13 +315,11 @@ if not processed_df.empty:
 else:
     st.info("Could not process results into a summary view.")
 """,
-                "5_Public_Results.py": """
+    "5_Public_Results.py": """
 import streamlit as st
-import pandas as pd
 import logging
-import json
-import os
 from pathlib import Path
+from src.summary import load_all_results, load_summary, results_fingerprint
 
 logger = logging.getLogger(__name__)
 st.set_page_config(page_title="Public Results - AltDOGE", layout="wide")
@@ -328,57 +327,16 @@ st.set_page_config(page_title="Public Results - AltDOGE", layout="wide")
 PROJECT_ROOT = Path(__file__).parent.parent.resolve()
 OUTPUT_DIR = PROJECT_ROOT / "output"
 
-@st.cache_data
-def load_all_results(output_dir: Path) -> pd.DataFrame:
-    all_results = []
-    if not output_dir.exists():
-        logger.warning(f"Output directory does not exist: {output_dir}")
-        return pd.DataFrame()
-    result_files = sorted(output_dir.glob("analysis_results_*.json"), key=os.path.getmtime, reverse=True)
-    for file_path in result_files:
-        try:
-            with open(file_path, "r", encoding='utf-8') as f:
-                data = json.load(f)
-                all_results.extend(data)
-        except Exception as e:
-            logger.error(f"Could not read file {file_path}: {e}")
-    return pd.DataFrame(all_results) if all_results else pd.DataFrame()
-
-def create_summary_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return pd.DataFrame()
-    processed_rows = []
-    for _, row in df.iterrows():
-        meta_analysis = row.get('meta_analysis', {})
-        if not isinstance(meta_analysis, dict):
-            meta_analysis = {}
-        bullet_summary_list = meta_analysis.get('bullet_summary', [])
-        if isinstance(bullet_summary_list, list):
-            bullet_summary = "\\n".join(f"- {item}" for item in bullet_summary_list)
-        else:
-            bullet_summary = "Summary not available."
-        new_row = {
-            'document_number': row.get('document_number'),
-            'title': row.get('title'),
-            'agency': row.get('agency'),
-            'Strategy': row.get('prompt_strategy_name', 'Unknown'),
-            'Recommended Action': meta_analysis.get('recommended_action', 'N/A'),
-            'Goal Alignment': meta_analysis.get('goal_alignment', 'N/A'),
-            'Summary': bullet_summary
-        }
-        processed_rows.append(new_row)
-    return pd.DataFrame(processed_rows)
-
 st.title("Public Dashboard: Summary of All Analyses")
 st.info("This page displays a cached summary of all previously completed regulation analyses.")
-raw_df = load_all_results(OUTPUT_DIR)
+fingerprint = results_fingerprint(OUTPUT_DIR)
+unique_df, _ = load_all_results(OUTPUT_DIR, fingerprint)
 
-if raw_df.empty:
+if unique_df.empty:
     st.warning("No result files found. Analysis may not have been run yet.")
     st.stop()
 
-unique_df = raw_df.drop_duplicates(subset=['document_number'], keep='last').copy()
-processed_df = create_summary_dataframe(unique_df)
+processed_df = load_summary(OUTPUT_DIR, fingerprint)
 
 st.subheader("Summary by Regulation")
 
@@ -391,36 +349,126 @@ if not processed_df.empty:
 else:
     st.info("Could not process results into a summary view.")
 """
-            }
-
-            for file_name, content in page_contents.items():
-                page_path = self.pages_dir / file_name
-                page_path.write_text(content)
-
-            old_placeholders = ["1_dashboard.py", "2_analysis.py", "3_proposals.py", "4_comments.py", "5_settings.py"]
-            for old_file in old_placeholders:
-                if old_file not in page_contents:
-                    old_path = self.pages_dir / old_file
-                    if old_path.exists():
-                        old_path.unlink()
+}
+_PAGE_FILES = tuple((name, content.encode("utf-8")) for name, content in _PAGE_CONTENTS.items())
 
-            src_files = {
-                "app.py": """# This file is deprecated and can be removed. run_altDOGE.py is the main entrypoint.""",
-                "database.py": """import sqlite3
-from typing import Any, List, Tuple
+_SRC_CONTENTS = {
+    "app.py": """# This file is deprecated and can be removed. run_altDOGE.py is the main entrypoint.""",
+    "database.py": """import queue
+import sqlite3
+import threading
+from typing import Any, Iterable, List, Tuple
 from contextlib import contextmanager
 
 class Database:
-    def __init__(self, db_path: str):
+    # WAL lets readers run alongside the ingest writer, and synchronous=NORMAL drops the fsync per commit.
+    # journal_mode=WAL persists in the database file, so re-issuing it on later connects is a no-op;
+    # the other settings are per-connection and must be applied every time one is opened.
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-65536",
+    )
+
+    # Tables and columns added after the first release; init.py's _SCHEMA_SQL and _ADDED_COLUMNS define the same.
+    # upgrade_schema applies them, so an install upgraded without rerunning init.py still matches the code.
+    ADDED_TABLES = {
+        "llm_cache": "CREATE TABLE IF NOT EXISTS llm_cache "
+                     "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)",
+    }
+    ADDED_COLUMNS = (
+        ("users", "salt", "BLOB"),
+        ("regulations", "full_text_xml_url", "TEXT"),
+    )
+
+    def __init__(self, db_path: str, cached_statements: int = 256, max_connections: int = 10,
+                 acquire_timeout: float = 30.0):
         self.db_path = db_path
+        self.cached_statements = cached_statements
+        self.max_connections = max_connections
+        self.acquire_timeout = acquire_timeout
+        # Connections are reused most-recently-returned first, so the warmest page and statement caches get used.
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=self.cached_statements)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._opened < self.max_connections
+            if can_open:
+                self._opened += 1
+        if can_open:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        try:
+            return self._pool.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"Timed out after {self.acquire_timeout}s waiting for one of {self.max_connections} connections")
 
     @contextmanager
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+        # Connections stay open between queries so SQLite's page and prepared-statement caches survive.
+        conn = self._acquire()
         try:
             yield conn
+        except Exception:
+            conn.rollback()
+            raise
         finally:
+            self._pool.put(conn)
+
+    def close(self):
+        # Closes the idle pooled connections; ones checked out are returned to the pool as usual.
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
             conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    def upgrade_schema(self) -> List[str]:
+        # Cheap enough to run once per process: a lookup per added table, a PRAGMA per altered table, and DDL only
+        # when something is missing. Tables in ADDED_COLUMNS that don't exist yet are left for init.py to create.
+        # Returns the names of the tables and "table.column"s added.
+        added = []
+        with self.get_connection() as conn:
+            existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for table, create_sql in self.ADDED_TABLES.items():
+                if table not in existing:
+                    conn.execute(create_sql)
+                    added.append(table)
+            for table, column, column_type in self.ADDED_COLUMNS:
+                columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                if not columns or column in columns:
+                    continue
+                try:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                    added.append(f"{table}.{column}")
+                except sqlite3.OperationalError as e:
+                    # Another process added it between the check and the ALTER.
+                    if "duplicate column name" not in str(e):
+                        raise
+            conn.commit()
+        return added
 
     def execute_query(self, query: str, params: Tuple = ()) -> List[Any]:
         with self.get_connection() as conn:
@@ -428,22 +476,46 @@ class Database:
             cursor.execute(query, params)
             conn.commit()
             return cursor.fetchall()
+
+    def execute_many(self, query: str, params_seq: Iterable[Tuple]) -> int:
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(query, params_seq)
+            conn.commit()
+            return cursor.rowcount
 """,
-                "authmanager.py": """from src.database import Database
+    "authmanager.py": """from src.database import Database
 from typing import Optional
 import hashlib
+import hmac
+import os
+
+PBKDF2_ITERATIONS = 100_000
+
+def hash_password(password: str, salt: bytes) -> str:
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS).hex()
 
 class AuthManager:
     def __init__(self, db: Database):
         self.db = db
 
     def authenticate(self, username: str, password: str) -> Optional[int]:
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
-        query = "SELECT id FROM users WHERE username = ? AND password_hash = ?"
-        result = self.db.execute_query(query, (username, password_hash))
-        return result[0][0] if result else None
+        query = "SELECT id, salt, password_hash FROM users WHERE username = ?"
+        result = self.db.execute_query(query, (username,))
+        if not result:
+            return None
+        user_id, salt, stored_hash = result[0]
+        if salt is None:
+            # Accounts from before salting hold a bare SHA-256; rehash them on their next successful login.
+            if not hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored_hash):
+                return None
+            salt = os.urandom(16)
+            self.db.execute_query("UPDATE users SET salt = ?, password_hash = ? WHERE id = ?",
+                                  (salt, hash_password(password, salt), user_id))
+            return user_id
+        return user_id if hmac.compare_digest(hash_password(password, salt), stored_hash) else None
 """,
-                "logger_config.py": """import logging
+    "logger_config.py": """import logging
 import sys
 from pathlib import Path
 
@@ -466,17 +538,138 @@ def setup_logging():
     root_logger.addHandler(stream_handler)
     logging.info("Logging configured to write to console and altdoge.log")
 """,
-                "llm_caller.py": """import logging
+    "summary.py": """import streamlit as st
+import pandas as pd
+import logging
+import orjson
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+# Shared by the Review Summary and Public Results pages, so both use one set of cache entries.
+logger = logging.getLogger(__name__)
+
+
+def _scan_results(output_dir: Path) -> List[Tuple[Path, os.stat_result]]:
+    # One directory pass shared by the listing and the fingerprint. DirEntry.stat() still costs a syscall per
+    # file on Linux; a missing directory simply has no results.
+    try:
+        with os.scandir(output_dir) as entries:
+            return [(Path(entry.path), entry.stat()) for entry in entries
+                    if entry.name.startswith("analysis_results_") and entry.name.endswith(".json")]
+    except FileNotFoundError:
+        return []
+
+
+def list_results_files(output_dir: Path) -> List[Path]:
+    # Newest first.
+    scanned = sorted(_scan_results(output_dir), key=lambda item: item[1].st_mtime_ns, reverse=True)
+    return [path for path, _ in scanned]
+
+
+def results_fingerprint(output_dir: Path) -> tuple:
+    # Name, mtime and size of every results file: any added, removed or rewritten file changes the key.
+    return tuple(sorted((path.name, stat.st_mtime_ns, stat.st_size) for path, stat in _scan_results(output_dir)))
+
+
+def read_results_file(file_path: Path):
+    try:
+        return orjson.loads(file_path.read_bytes())
+    except Exception as e:
+        logger.error(f"Could not read file {file_path}: {e}")
+        return None
+
+
+# cache_resource hands back the cached DataFrame itself rather than a copy on every rerun; the pages only
+# read it. The fingerprint argument makes a new or removed results file load fresh data.
+@st.cache_resource(ttl=300)
+def load_all_results(output_dir: Path, fingerprint: tuple) -> Tuple[pd.DataFrame, int]:
+    if not output_dir.exists():
+        logger.warning(f"Output directory does not exist: {output_dir}")
+        return pd.DataFrame(), 0
+    frames = []
+    total_results = 0
+    seen = set()
+    result_files = list_results_files(output_dir)
+    # Rows are listed newest file first and the last occurrence of a document wins, so walk oldest file
+    # first and each file bottom-up, keeping the first occurrence: duplicates never enter the DataFrame.
+    # Files are read and parsed on a thread pool; map() still yields them oldest first for the walk below.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        payloads = list(executor.map(read_results_file, reversed(result_files)))
+    for file_path, records in zip(reversed(result_files), payloads):
+        if records is None:
+            continue
+        try:
+            kept = []
+            for record in reversed(records):
+                document_number = record.get('document_number')
+                if document_number not in seen:
+                    seen.add(document_number)
+                    kept.append(record)
+            total_results += len(records)
+        except Exception as e:
+            logger.error(f"Could not read file {file_path}: {e}")
+            continue
+        if kept:
+            kept.reverse()
+            frames.append(pd.DataFrame(kept))
+    frames.reverse()
+    unique_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return unique_df, total_results
+
+
+def create_summary_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return pd.DataFrame()
+
+    # Pull whole columns out once instead of building a Series per row with iterrows().
+    def column(name, default=None):
+        return df[name].tolist() if name in df.columns else [default] * len(df)
+
+    metas = [m if isinstance(m, dict) else {} for m in column('meta_analysis', {})]
+    summaries = []
+    for meta_analysis in metas:
+        bullet_summary_list = meta_analysis.get('bullet_summary', [])
+        if isinstance(bullet_summary_list, list):
+            summaries.append("\\n".join(f"- {item}" for item in bullet_summary_list))
+        else:
+            summaries.append("Summary not available.")
+    return pd.DataFrame({
+        'document_number': column('document_number'),
+        'title': column('title'),
+        'agency': column('agency'),
+        'Strategy': column('prompt_strategy_name', 'Unknown'),
+        'Recommended Action': [m.get('recommended_action', 'N/A') for m in metas],
+        'Goal Alignment': [m.get('goal_alignment', 'N/A') for m in metas],
+        'Summary': summaries
+    })
+
+
+# Built once per results fingerprint alongside load_all_results, so reruns skip the summary build as well.
+@st.cache_resource(ttl=300)
+def load_summary(output_dir: Path, fingerprint: tuple) -> pd.DataFrame:
+    unique_df, _ = load_all_results(output_dir, fingerprint)
+    return create_summary_dataframe(unique_df)
+""",
+    "llm_caller.py": """import logging
 import json
 import time
 from typing import List, Dict, Any, Optional
-import litellm
-from litellm.exceptions import APIError, RateLimitError, ServiceUnavailableError, BadRequestError
 from json_repair import repair_json
 
-litellm.telemetry = False
-litellm.set_verbose = False
 logger = logging.getLogger(__name__)
+_litellm = None
+
+def _get_litellm():
+    # litellm pulls in hundreds of modules, so load it on the first model call rather than at app startup.
+    global _litellm
+    if _litellm is None:
+        import litellm
+        litellm.telemetry = False
+        litellm.set_verbose = False
+        _litellm = litellm
+    return _litellm
 
 def _parse_llm_response(response_content: str, response_format_type: str) -> Any:
     if response_format_type == "json_object":
@@ -493,6 +686,7 @@ def call_model_with_prompt(
     messages = prompt_config.get("messages", [])
     model_params = prompt_config.get("params", {}).copy()
     model_params.pop('model', None)
+    litellm = _get_litellm()
     for attempt in range(max_retries):
         try:
             logger.info(f"Querying {model_name} (Attempt {attempt + 1}/{max_retries})...")
@@ -500,7 +694,7 @@ def call_model_with_prompt(
             raw_content = response.choices[0].message.content
             parsed_content = _parse_llm_response(raw_content, response_format_type)
             return {"parsed_content": parsed_content, "raw_content": raw_content}
-        except (RateLimitError, ServiceUnavailableError) as e:
+        except (litellm.exceptions.RateLimitError, litellm.exceptions.ServiceUnavailableError) as e:
             delay = initial_delay * (2 ** attempt)
             logger.warning(f"Rate limit/service unavailable for {model_name}: {e}. Retrying in {delay}s...")
             time.sleep(delay)
@@ -534,11 +728,125 @@ def get_responses_from_multiple_models(
         all_responses[model_to_use].append(response_data)
     return all_responses
 """,
-            }
-            for file_name, content in src_files.items():
-                file_path = self.src_dir / file_name
-                if not file_path.exists() or "deprecated" in content:
-                    file_path.write_text(content)
+}
+_SRC_FILES = tuple((name, content.encode("utf-8")) for name, content in _SRC_CONTENTS.items())
+
+
+def _content_matches(path: Path, content: bytes) -> bool:
+    """True if path already holds exactly content, checking the size before reading the file."""
+    try:
+        if path.stat().st_size != len(content):
+            return False
+        return path.read_bytes() == content
+    except FileNotFoundError:
+        return False
+
+
+def _requirements_satisfied(requirements: str) -> bool:
+    """True if every line of requirements is installed in this interpreter, at the pinned version if one is given."""
+    for line in requirements.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        name, _, pinned_version = line.partition("==")
+        try:
+            installed_version = importlib.metadata.version(name.strip())
+        except importlib.metadata.PackageNotFoundError:
+            return False
+        if pinned_version and installed_version != pinned_version.strip():
+            return False
+    return True
+
+
+def _atomic_write(path: Path, content: bytes) -> None:
+    """Writes to a temp file beside path and renames it over path, so a crash never leaves a partial file."""
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _write_if_changed(path: Path, content: bytes) -> None:
+    if not _content_matches(path, content):
+        _atomic_write(path, content)
+
+
+class AltDOGEInitializer:
+    def __init__(self):
+        self.project_dir = Path(__file__).parent
+        self.db_path = self.project_dir / "altDOGE.db"
+        self.env_path = self.project_dir / ".env"
+        self.requirements_path = self.project_dir / "requirements.txt"
+        self.requirements_sentinel_path = self.project_dir / ".requirements.sha256"
+        self.init_sentinel_path = self.project_dir / ".altdoge_initialized"
+        self.prompts_path = self.project_dir / "prompt_strategies.json"
+        self.min_python_version = (3, 12)
+        self.src_dir = self.project_dir / "src"
+        self.pages_dir = self.project_dir / "pages"
+
+    def check_python_version(self) -> bool:
+        """Checks the running interpreter in-process; any 3.12+ release is accepted, not one exact version."""
+        if sys.version_info < self.min_python_version:
+            required = ".".join(map(str, self.min_python_version))
+            logger.error(f"Python {required} or newer is required, found {sys.version.split()[0]}")
+            return False
+        return True
+
+    def create_prompt_strategies_file(self) -> bool:
+        """Creates the prompt_strategies.json file with default content."""
+        try:
+            if self.prompts_path.exists():
+                logger.info(f"{self.prompts_path.name} already exists, skipping creation.")
+                return True
+
+            try:
+                import orjson  # Not installed yet on a first run, since dependencies are installed after this step.
+                content = orjson.dumps(_DEFAULT_PROMPT_STRATEGIES, option=orjson.OPT_INDENT_2)
+            except ImportError:
+                content = json.dumps(_DEFAULT_PROMPT_STRATEGIES, indent=2).encode("utf-8")
+            _atomic_write(self.prompts_path, content)
+            logger.info(f"{self.prompts_path.name} created successfully.")
+            return True
+        except Exception as e:
+            logger.error(f"Error creating {self.prompts_path.name}: {e}")
+            return False
+
+    def create_repository_structure(self) -> bool:
+        """Create the repository structure with necessary directories and files."""
+        try:
+            # Create directories
+            self.src_dir.mkdir(exist_ok=True)
+            self.pages_dir.mkdir(exist_ok=True)
+
+            # Create __init__.py in src
+            init_path = self.src_dir / "__init__.py"
+            if not init_path.exists():
+                init_path.touch()
+
+            # --- Write Streamlit page and src files ---
+            # src files are only written when missing, except the deprecated stub which is always refreshed
+            files = [(self.pages_dir / file_name, content) for file_name, content in _PAGE_FILES]
+            files += [(self.src_dir / file_name, content) for file_name, content in _SRC_FILES
+                      if b"deprecated" in content or not (self.src_dir / file_name).exists()]
+            # The writes are independent, so overlap them instead of waiting on each in turn.
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda file: _write_if_changed(*file), files))
+
+            old_placeholders = ["1_dashboard.py", "2_analysis.py", "3_proposals.py", "4_comments.py", "5_settings.py"]
+            for old_file in old_placeholders:
+                if old_file not in _PAGE_CONTENTS:
+                    old_path = self.pages_dir / old_file
+                    if old_path.exists():
+                        old_path.unlink()
 
             logger.info("Repository structure created successfully")
             return True
@@ -559,10 +867,22 @@ requests==2.32.3
 tqdm
 json-repair
 backoff
+orjson
 """
-            self.requirements_path.write_text(requirements_content)
-            subprocess.run(["uv", "pip", "install", "-r", str(self.requirements_path)], check=True)
-            logger.info("Dependencies installed successfully with uv")
+            content = requirements_content.encode("utf-8")
+            _write_if_changed(self.requirements_path, content)
+            # Keyed on the interpreter too, so switching environments still triggers an install.
+            digest = hashlib.sha256(content + sys.executable.encode("utf-8")).hexdigest()
+            if (self.requirements_sentinel_path.exists()
+                    and self.requirements_sentinel_path.read_text().strip() == digest):
+                logger.info("Requirements unchanged since the last install, skipping uv")
+                return True
+            if _requirements_satisfied(requirements_content):
+                logger.info("All requirements already installed, skipping uv")
+            else:
+                subprocess.run(["uv", "pip", "install", "-r", str(self.requirements_path)], check=True)
+                logger.info("Dependencies installed successfully with uv")
+            self.requirements_sentinel_path.write_text(digest)
             return True
         except (subprocess.CalledProcessError, FileNotFoundError) as e:
             logger.error(f"Error installing dependencies: {str(e)}")
@@ -571,41 +891,79 @@ backoff
     def init_database(self) -> bool:
         """Initialize SQLite database with required tables and default users."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            # Default users are hashed exactly as AuthManager verifies them; src/ is written by an earlier step,
+            # but an existing src/authmanager.py is kept, and one from before salted passwords has no hash_password.
+            from src.authmanager import hash_password
+        except ImportError as e:
+            logger.error(f"Error initializing database: src/authmanager.py is out of date ({e}). "
+                         "Delete it and rerun init.py to regenerate it.")
+            return False
+        try:
+            # Autocommit mode with one explicit transaction, so the whole schema and seed data commit together.
+            with closing(sqlite3.connect(self.db_path, isolation_level=None)) as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        username TEXT UNIQUE NOT NULL,
-                        password_hash TEXT NOT NULL
-                    )
-                """)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS regulations (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        reg_number TEXT NOT NULL UNIQUE,
-                        title TEXT,
-                        text TEXT,
-                        effective_date TEXT,
-                        agency TEXT
-                    )
-                """)
-                default_users = [("admin", "AdminPass123"), ("test", "TestPass123")]
-                for username, password in default_users:
-                    password_hash = hashlib.sha256(password.encode()).hexdigest()
-                    cursor.execute("INSERT OR IGNORE INTO users (username, password_hash) VALUES (?, ?)",
-                                   (username, password_hash))
-                conn.commit()
+                # journal_mode is stored in the database file, so every later connection opens in WAL mode.
+                # It can't be changed inside a transaction, so set it before BEGIN.
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                try:
+                    # BEGIN goes inside the script: executescript commits any transaction already open.
+                    cursor.executescript("BEGIN IMMEDIATE;" + _SCHEMA_SQL)
+                    for table, column, column_type in _ADDED_COLUMNS:
+                        columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+                        if column not in columns:
+                            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                    # Deduplicating scans the whole table, so only do it the one time the unique index is missing.
+                    has_reg_index = cursor.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_reg_number'").fetchone()
+                    if not has_reg_index:
+                        # Keep the first copy of any duplicated reg_number so the unique index can be built.
+                        removed = cursor.execute(
+                            "DELETE FROM regulations WHERE id NOT IN (SELECT MIN(id) FROM regulations GROUP BY reg_number)"
+                        ).rowcount
+                        if removed:
+                            logger.info(f"Removed {removed} duplicate regulations before indexing reg_number")
+                        cursor.execute("CREATE UNIQUE INDEX idx_reg_number ON regulations(reg_number)")
+                    default_users = [("admin", "AdminPass123"), ("test", "TestPass123")]
+                    user_rows = []
+                    for username, password in default_users:
+                        salt = os.urandom(16)
+                        user_rows.append((username, hash_password(password, salt), salt))
+                    cursor.executemany(
+                        "INSERT OR IGNORE INTO users (username, password_hash, salt) VALUES (?, ?, ?)", user_rows)
+                    cursor.execute("COMMIT")
+                except sqlite3.Error:
+                    if conn.in_transaction:
+                        cursor.execute("ROLLBACK")
+                    raise
             logger.info("Database initialized successfully")
             return True
         except sqlite3.Error as e:
             logger.error(f"Error initializing database: {str(e)}")
             return False
 
-    def run(self) -> bool:
-        """Run the initialization process."""
+    def _init_fingerprint(self) -> dict:
+        """Identifies this initializer (its templates, requirements and schema) and the target interpreter."""
+        source_hash = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16).hexdigest()
+        return {"version": 1, "init_sha": source_hash, "python": sys.executable}
+
+    def _already_initialized(self) -> bool:
+        try:
+            recorded = json.loads(self.init_sentinel_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        outputs_exist = self.db_path.exists() and self.prompts_path.exists() and all(
+            (self.pages_dir / file_name).exists() for file_name, _ in _PAGE_FILES)
+        return outputs_exist and recorded == self._init_fingerprint()
+
+    def run(self, force: bool = False) -> bool:
+        """Run the initialization process, unless this exact initializer has already completed here."""
+        if not force and self._already_initialized():
+            logger.info("AltDOGE already initialized, skipping (pass --force to rerun)")
+            return True
         logger.info("Starting AltDOGE initialization...")
         steps = [
+            (self.check_python_version, "Checking Python version"),
             (self.create_repository_structure, "Creating repository structure"),
             (self.create_prompt_strategies_file, "Creating prompt strategies file"),
             (self.install_dependencies, "Installing dependencies"),
@@ -617,11 +975,12 @@ backoff
                 logger.error(f"Initialization failed at step: {step_name}")
                 return False
 
+        self.init_sentinel_path.write_text(json.dumps(self._init_fingerprint()))
         logger.info("AltDOGE initialization completed successfully")
         return True
 
 
 if __name__ == "__main__":
     initializer = AltDOGEInitializer()
-    success = initializer.run()
+    success = initializer.run(force="--force" in sys.argv[1:])
     sys.exit(0 if success else 1)
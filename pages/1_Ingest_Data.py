@@ -1,8 +1,9 @@
 # pages/1_Ingest_Data.py
 import streamlit as st
 import logging
+import time
 from datetime import datetime
-import json
+import orjson
 
 logger = logging.getLogger(__name__)
 st.set_page_config(page_title="Ingest Data - AltDOGE", layout="wide")
@@ -18,14 +19,19 @@ if "user_id" not in st.session_state or st.session_state.user_id is None:
     st.page_link("run_altDOGE.py", label="Go to Login", icon="🏠")
     st.stop()
 
+# The agency list changes rarely; build the dropdown options once an hour for all sessions rather than on
+# every rerun. A failed fetch is not kept, so the next session tries again.
+@st.cache_resource(ttl=3600)
+def load_agency_options(_ingestion_manager) -> dict:
+    return {agency['name']: agency['slug'] for agency in _ingestion_manager.agencies}
+
 st.title("Ingest Federal Register Data")
 start_date = st.text_input("Start Date (YYYY-MM-DD)", "2025-07-01")
 end_date = st.text_input("End Date (YYYY-MM-DD)", "2025-07-31")
 
 # --- Agency Dropdown ---
-all_agencies = runner.ingestion_manager.agencies
-if all_agencies:
-    agency_options = {agency['name']: agency['slug'] for agency in all_agencies}
+agency_options = load_agency_options(runner.ingestion_manager)
+if agency_options:
     agency_names = ["All Agencies"] + list(agency_options.keys())
     selected_agency_name = st.selectbox(
         "Select an Agency (optional)",
@@ -34,6 +40,7 @@ if all_agencies:
     )
     agency_slug = agency_options.get(selected_agency_name)
 else:
+    load_agency_options.clear()
     st.warning("Could not fetch agency list. Please enter agency slug manually.")
     agency_slug = st.text_input("Agency Slug (e.g., securities-and-exchange-commission)", "")
 
@@ -45,9 +52,15 @@ llm_call_limit = st.number_input("Total LLM Call Limit", min_value=1, value=4,
 
 if st.button("Start Ingestion"):
     progress_bar = st.progress(0, text="Starting ingestion...")
+    last_progress_update = [0.0]
 
 
     def streamlit_progress_callback(current, total, message):
+        # Every update is a message to the browser; send at most ten a second, but always the final one.
+        now = time.monotonic()
+        if now - last_progress_update[0] < 0.1 and current != total:
+            return
+        last_progress_update[0] = now
         if total > 0:
             progress_bar.progress(current / total, text=message)
         else:
@@ -63,9 +76,12 @@ if st.button("Start Ingestion"):
 
     if result["status"] == "success":
         st.success(f"Processed {len(result['results'])} documents")
+        if result.get("unsaved_documents"):
+            st.warning(f"{len(result['unsaved_documents'])} analyzed documents could not be saved to the database "
+                       f"and won't appear in stored regulations: {', '.join(result['unsaved_documents'])}. "
+                       "See the log for details.")
         output_file = runner.output_dir / f"analysis_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, "w") as f:
-            json.dump(result["results"], f, indent=2)
+        output_file.write_bytes(orjson.dumps(result["results"], option=orjson.OPT_INDENT_2))
         st.write(f"Results saved to {output_file}")
         st.info("You can now view the results on the 'View Ingestion Results' page.")
         st.json(result["results"][:5])
@@ -1,8 +1,6 @@
 
 import streamlit as st
 import logging
-import json
-import os
 
 logger = logging.getLogger(__name__)
 st.set_page_config(page_title="View Results - AltDOGE", layout="wide")
@@ -18,16 +16,26 @@ if "user_id" not in st.session_state or st.session_state.user_id is None:
     st.page_link("run_altDOGE.py", label="Go to Login", icon="🏠")
     st.stop()
 
+# Imported past the login checks, so visits that are turned away never load pandas.
+import orjson
+from src.summary import list_results_files
+
+# Every widget interaction reruns the page; parse each results file once per modification rather than per rerun.
+# cache_resource returns the parsed list itself instead of a copy, and it is only read below.
+@st.cache_resource(max_entries=8)
+def load_results_file(path: str, mtime_ns: int) -> list:
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
 st.header("View Ingestion Results")
 try:
-    result_files = sorted(runner.output_dir.glob("analysis_results_*.json"), key=os.path.getmtime, reverse=True)
+    result_files = list_results_files(runner.output_dir)
     if not result_files:
         st.warning("No result files found. Please run an ingestion first.")
     else:
         selected_file = st.selectbox("Select a result file to view:", options=result_files, format_func=lambda p: p.name)
         if selected_file:
-            with open(selected_file, "r", encoding='utf-8') as f:
-                results_data = json.load(f)
+            results_data = load_results_file(str(selected_file), selected_file.stat().st_mtime_ns)
             st.write(f"Displaying results from `{selected_file.name}`")
             st.write(f"Total documents analyzed: {len(results_data)}")
             for doc_result in results_data:
@@ -20,9 +20,12 @@ st.title("Analyze a Specific Regulation by ID")
 prompt_strategies = runner.ingestion_manager.prompt_strategies.keys()
 selected_strategy = st.selectbox("Select Prompt Strategy", options=list(prompt_strategies))
 reg_id = st.number_input("Regulation ID from Database", min_value=1, step=1)
+use_cache = not st.checkbox("Re-run prompts instead of reusing cached responses",
+                            help="Cached responses expire after a week. Re-running refreshes the cache.")
 if st.button("Analyze"):
     with st.spinner(f"Analyzing regulation {reg_id} with '{selected_strategy}' strategy..."):
-        result = runner.ingestion_manager.analyze_regulation(reg_id, prompt_strategy_name=selected_strategy)
+        result = runner.ingestion_manager.analyze_regulation(reg_id, prompt_strategy_name=selected_strategy,
+                                                             use_cache=use_cache)
         if "error" not in result:
             st.success("Analysis complete")
             st.json(result)
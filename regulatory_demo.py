@@ -2,13 +2,16 @@ import requests
 import xml.etree.ElementTree as ET
 from src.database import Database
 from src.litellm_fallback import LiteLLMFallback
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
 import os
+import threading
 from datetime import datetime
 from dotenv import load_dotenv
 import logging
 import backoff
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -18,6 +21,18 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
+def _env_workers(name: str, default: int) -> int:
+    """Reads a worker count from the environment, falling back to default when unset or invalid, and at least 1."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(f"Ignoring {name}={value!r}: not an integer. Using {default}.")
+        return default
+
+
 class IngestionManager:
     def __init__(self, db: Database, llm: LiteLLMFallback):
         self.db = db
@@ -25,6 +40,12 @@ class IngestionManager:
         self.api_key = os.getenv("FEDERAL_REGISTER_API_KEY")
         self.base_url = "https://www.federalregister.gov/api/v1/documents"
         self.chunk_size = 100  # Number of documents per chunk
+        self.doc_workers = _env_workers("ALTDOGE_DOC_WORKERS", 8)  # Documents analyzed concurrently
+        self.prompt_workers = _env_workers("ALTDOGE_PROMPT_WORKERS", 4)  # Prompt threads per document
+        # Documents and their prompts each run in their own pool, so cap LLM calls across both levels here;
+        # otherwise doc_workers * prompt_workers requests could be in flight at once.
+        self.llm_workers = _env_workers("ALTDOGE_LLM_WORKERS", 4)
+        self.llm_slots = threading.BoundedSemaphore(self.llm_workers)
 
     @backoff.on_exception(backoff.expo, requests.exceptions.RequestException, max_tries=3)
     def fetch_federal_register_data(self, start_date: str = "2025-01-20") -> List[Dict[str, Any]]:
@@ -93,20 +114,17 @@ class IngestionManager:
 
     def chunk_by_agency(self, documents: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """Organize documents by agency, chunking large datasets."""
-        agency_chunks = {}
+        by_agency = defaultdict(list)
         for doc in documents:
             agencies = [agency.get("name", "Unknown") for agency in doc.get("agencies", [])]
-            agency_name = agencies[0] if agencies else "Unknown"
-
-            if agency_name not in agency_chunks:
-                agency_chunks[agency_name] = []
-            agency_chunks[agency_name].append(doc)
+            by_agency[agencies[0] if agencies else "Unknown"].append(doc)
 
-            # Chunk if exceeding size limit
-            if len(agency_chunks[agency_name]) > self.chunk_size:
-                agency_chunks[f"{agency_name}_{len(agency_chunks[agency_name]) // self.chunk_size}"] = \
-                    agency_chunks[agency_name][-self.chunk_size:]
-                agency_chunks[agency_name] = agency_chunks[agency_name][:-self.chunk_size]
+        # Split each agency into fixed-size chunks in one pass: "<agency>", "<agency>_1", "<agency>_2", ...
+        agency_chunks = {}
+        for agency_name, docs in by_agency.items():
+            for n, start in enumerate(range(0, len(docs), self.chunk_size)):
+                key = agency_name if n == 0 else f"{agency_name}_{n}"
+                agency_chunks[key] = docs[start:start + self.chunk_size]
 
         return agency_chunks
 
@@ -119,57 +137,67 @@ class IngestionManager:
             "Assess the clarity of the following regulation and suggest rephrasing to reduce ambiguity:\n{text}"
         ]
 
-    def analyze_chunk(self, chunk: List[Dict[str, Any]], agency: str) -> List[Dict[str, Any]]:
-        """Analyze a chunk of documents with alternative prompts."""
-        results = []
-        prompts = self.define_alternative_prompts()
-
-        for doc in chunk:
-            text = self.parse_xml_content(doc.get("full_text_xml_url", ""))
-            if not text:
-                continue
-
-            doc_id = doc.get("document_number", "")
-            analysis_results = []
-
-            for prompt_template in prompts:
-                prompt = prompt_template.format(text=text[:4000])  # Limit prompt size
-                try:
-                    result = self.llm.completion_with_fallback(prompt)
-                    if result["status"] == "success":
-                        analysis_results.append({
-                            "prompt": prompt_template.split("\n")[0],
-                            "result": result["response"]
-                        })
-                    else:
-                        analysis_results.append({
-                            "prompt": prompt_template.split("\n")[0],
-                            "error": result["message"]
-                        })
-                except Exception as e:
-                    logger.error(f"LLM analysis failed for document {doc_id}: {str(e)}")
-                    analysis_results.append({
-                        "prompt": prompt_template.split("\n")[0],
-                        "error": str(e)
-                    })
-
-            # Store regulation in database
-            reg_data = {
-                "document_number": doc_id,
-                "title": doc.get("title", ""),
-                "text": text,
-                "publication_date": doc.get("publication_date", ""),
-                "agency": agency
+    def analyze_prompt(self, prompt_template: str, text: str, doc_id: str) -> Dict[str, Any]:
+        """Run one alternative prompt against a document's text."""
+        prompt = prompt_template.format(text=text[:4000])  # Limit prompt size
+        try:
+            with self.llm_slots:
+                result = self.llm.completion_with_fallback(prompt)
+            if result["status"] == "success":
+                return {
+                    "prompt": prompt_template.split("\n")[0],
+                    "result": result["response"]
+                }
+            return {
+                "prompt": prompt_template.split("\n")[0],
+                "error": result["message"]
+            }
+        except Exception as e:
+            logger.error(f"LLM analysis failed for document {doc_id}: {str(e)}")
+            return {
+                "prompt": prompt_template.split("\n")[0],
+                "error": str(e)
             }
-            self.ingest_regulation(reg_data)
 
-            results.append({
-                "document_number": doc_id,
-                "agency": agency,
-                "analyses": analysis_results
-            })
+    def process_document(self, doc: Dict[str, Any], agency: str, prompts: List[str]) -> Optional[Dict[str, Any]]:
+        """Fetch, analyze and store one document; returns None when it has no text."""
+        text = self.parse_xml_content(doc.get("full_text_xml_url", ""))
+        if not text:
+            return None
+
+        doc_id = doc.get("document_number", "")
+        # The prompts are independent network calls, so run them concurrently; map() keeps prompt order.
+        if len(prompts) == 1:
+            analysis_results = [self.analyze_prompt(prompts[0], text, doc_id)]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(prompts), self.prompt_workers)) as executor:
+                analysis_results = list(executor.map(
+                    lambda prompt_template: self.analyze_prompt(prompt_template, text, doc_id), prompts))
+
+        # Store regulation in database
+        reg_data = {
+            "document_number": doc_id,
+            "title": doc.get("title", ""),
+            "text": text,
+            "publication_date": doc.get("publication_date", ""),
+            "agency": agency
+        }
+        self.ingest_regulation(reg_data)
+
+        return {
+            "document_number": doc_id,
+            "agency": agency,
+            "analyses": analysis_results
+        }
 
-        return results
+    def analyze_chunk(self, chunk: List[Dict[str, Any]], agency: str) -> List[Dict[str, Any]]:
+        """Analyze a chunk of documents with alternative prompts."""
+        prompts = self.define_alternative_prompts()
+        # Documents are independent and network-bound, so overlap them. Database's connection pool lets the
+        # workers store regulations concurrently.
+        with ThreadPoolExecutor(max_workers=self.doc_workers) as executor:
+            results = executor.map(lambda doc: self.process_document(doc, agency, prompts), chunk)
+            return [result for result in results if result is not None]
 
     def process_federal_register(self, start_date: str = "2025-01-20") -> Dict[str, Any]:
         """Main method to fetch, chunk, and analyze Federal Register data."""
@@ -10,6 +10,7 @@ import os
 import logging
 import argparse
 import json
+import orjson
 from datetime import datetime
 from pathlib import Path
 import sys
@@ -41,9 +42,23 @@ def load_prompt_strategies() -> Dict[str, List[str]]:
         return {}
 
 
+@st.cache_resource
+def get_database(db_path: str) -> Database:
+    """One Database, and so one warm connection pool, shared by every Streamlit session in this process.
+
+    Tables and columns added since the database was created are filled in here, once per process, so a
+    checkout updated without rerunning init.py doesn't fail on login, ingestion or the LLM cache.
+    """
+    db = Database(db_path)
+    added = db.upgrade_schema()
+    if added:
+        logger.info(f"Added missing database tables and columns: {', '.join(added)}")
+    return db
+
+
 class AltDOGERunner:
     def __init__(self):
-        self.db = Database(str(PROJECT_ROOT / "altDOGE.db"))
+        self.db = get_database(str(PROJECT_ROOT / "altDOGE.db"))
         self.auth_manager = AuthManager(self.db)
         self.ingestion_manager = IngestionManager(self.db)
         self.stripe_integration = StripeIntegration(self.db)
@@ -120,9 +135,11 @@ class AltDOGERunner:
 
             if result["status"] == "success":
                 logger.info(f"Processed {len(result['results'])} documents")
+                if result.get("unsaved_documents"):
+                    logger.error(f"Could not save {len(result['unsaved_documents'])} analyzed documents to the "
+                                 f"database: {', '.join(result['unsaved_documents'])}")
                 output_file = self.output_dir / f"analysis_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                with open(output_file, "w") as f:
-                    json.dump(result["results"], f, indent=2)
+                output_file.write_bytes(orjson.dumps(result["results"], option=orjson.OPT_INDENT_2))
                 logger.info(f"Results saved to {output_file}")
                 return result
             else:
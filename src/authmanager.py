@@ -1,13 +1,30 @@
 from src.database import Database
 from typing import Optional
 import hashlib
+import hmac
+import os
+
+PBKDF2_ITERATIONS = 100_000
+
+def hash_password(password: str, salt: bytes) -> str:
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS).hex()
 
 class AuthManager:
     def __init__(self, db: Database):
         self.db = db
 
     def authenticate(self, username: str, password: str) -> Optional[int]:
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
-        query = "SELECT id FROM users WHERE username = ? AND password_hash = ?"
-        result = self.db.execute_query(query, (username, password_hash))
-        return result[0][0] if result else None
+        query = "SELECT id, salt, password_hash FROM users WHERE username = ?"
+        result = self.db.execute_query(query, (username,))
+        if not result:
+            return None
+        user_id, salt, stored_hash = result[0]
+        if salt is None:
+            # Accounts from before salting hold a bare SHA-256; rehash them on their next successful login.
+            if not hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored_hash):
+                return None
+            salt = os.urandom(16)
+            self.db.execute_query("UPDATE users SET salt = ?, password_hash = ? WHERE id = ?",
+                                  (salt, hash_password(password, salt), user_id))
+            return user_id
+        return user_id if hmac.compare_digest(hash_password(password, salt), stored_hash) else None
@@ -1,18 +1,118 @@
+import queue
 import sqlite3
-from typing import Any, List, Tuple
+import threading
+from typing import Any, Iterable, List, Tuple
 from contextlib import contextmanager
 
 class Database:
-    def __init__(self, db_path: str):
+    # WAL lets readers run alongside the ingest writer, and synchronous=NORMAL drops the fsync per commit.
+    # journal_mode=WAL persists in the database file, so re-issuing it on later connects is a no-op;
+    # the other settings are per-connection and must be applied every time one is opened.
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-65536",
+    )
+
+    # Tables and columns added after the first release; init.py's _SCHEMA_SQL and _ADDED_COLUMNS define the same.
+    # upgrade_schema applies them, so an install upgraded without rerunning init.py still matches the code.
+    ADDED_TABLES = {
+        "llm_cache": "CREATE TABLE IF NOT EXISTS llm_cache "
+                     "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)",
+    }
+    ADDED_COLUMNS = (
+        ("users", "salt", "BLOB"),
+        ("regulations", "full_text_xml_url", "TEXT"),
+    )
+
+    def __init__(self, db_path: str, cached_statements: int = 256, max_connections: int = 10,
+                 acquire_timeout: float = 30.0):
         self.db_path = db_path
+        self.cached_statements = cached_statements
+        self.max_connections = max_connections
+        self.acquire_timeout = acquire_timeout
+        # Connections are reused most-recently-returned first, so the warmest page and statement caches get used.
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=self.cached_statements)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._opened < self.max_connections
+            if can_open:
+                self._opened += 1
+        if can_open:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        try:
+            return self._pool.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"Timed out after {self.acquire_timeout}s waiting for one of {self.max_connections} connections")
 
     @contextmanager
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+        # Connections stay open between queries so SQLite's page and prepared-statement caches survive.
+        conn = self._acquire()
         try:
             yield conn
+        except Exception:
+            conn.rollback()
+            raise
         finally:
+            self._pool.put(conn)
+
+    def close(self):
+        # Closes the idle pooled connections; ones checked out are returned to the pool as usual.
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
             conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    def upgrade_schema(self) -> List[str]:
+        # Cheap enough to run once per process: a lookup per added table, a PRAGMA per altered table, and DDL only
+        # when something is missing. Tables in ADDED_COLUMNS that don't exist yet are left for init.py to create.
+        # Returns the names of the tables and "table.column"s added.
+        added = []
+        with self.get_connection() as conn:
+            existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for table, create_sql in self.ADDED_TABLES.items():
+                if table not in existing:
+                    conn.execute(create_sql)
+                    added.append(table)
+            for table, column, column_type in self.ADDED_COLUMNS:
+                columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                if not columns or column in columns:
+                    continue
+                try:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                    added.append(f"{table}.{column}")
+                except sqlite3.OperationalError as e:
+                    # Another process added it between the check and the ALTER.
+                    if "duplicate column name" not in str(e):
+                        raise
+            conn.commit()
+        return added
 
     def execute_query(self, query: str, params: Tuple = ()) -> List[Any]:
         with self.get_connection() as conn:
@@ -20,3 +120,10 @@ class Database:
             cursor.execute(query, params)
             conn.commit()
             return cursor.fetchall()
+
+    def execute_many(self, query: str, params_seq: Iterable[Tuple]) -> int:
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(query, params_seq)
+            conn.commit()
+            return cursor.rowcount
@@ -1,22 +1,29 @@
 # src/ingestionmanager.py
 import requests
-import xml.etree.ElementTree as ET
-from typing import Dict, Any, List, Optional
+from xml.parsers import expat
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import os
 from datetime import datetime
 from dotenv import load_dotenv
 import logging
 import backoff
+import functools
 from pathlib import Path
 import sys
 import urllib.parse
 import json
+import orjson
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Set project root and add to sys.path
 PROJECT_ROOT = Path(__file__).parent.parent.resolve()
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.database import Database
+from src.llm_cache import LLMCache
 from src import llm_caller
 
 # Configure logging
@@ -31,6 +38,43 @@ class LLMLimitReachedError(Exception):
     pass
 
 
+class RateLimiter:
+    """Spaces out calls so that at most requests_per_second of them start in any one second."""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _env_workers(name: str, default: int) -> int:
+    """Reads a worker count from the environment, falling back to default when unset or invalid, and at least 1."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(f"Ignoring {name}={value!r}: not an integer. Using {default}.")
+        return default
+
+
+def _is_permanent_request_error(e: requests.exceptions.RequestException) -> bool:
+    """Only connection problems, timeouts, 429s and server errors are worth retrying."""
+    if isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return False
+    response = getattr(e, "response", None)
+    return response is None or (response.status_code < 500 and response.status_code != 429)
+
+
 class IngestionManager:
     LLMLimitReachedError = LLMLimitReachedError
 
@@ -40,10 +84,20 @@ class IngestionManager:
         self.base_url = "https://www.federalregister.gov/api/v1/documents"
         self.chunk_size = 100
         self.request_timeout = 30  # Timeout for HTTP requests
+        self.xml_download_workers = 8  # Concurrent full-text XML downloads
+        self.prompt_workers = _env_workers("ALTDOGE_PROMPT_WORKERS", 4)  # Concurrent LLM calls per document
+        self.session = requests.Session()
+        self.session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=self.xml_download_workers))
+        self.rate_limiter = RateLimiter(requests_per_second=10)
         self.llm_calls_made = 0
         self.llm_call_limit = None
+        # Document numbers whose analysis ran but couldn't be stored in the database during this run
+        self.unsaved_documents: List[str] = []
+        # Cached responses expire after a week, so prompt or model changes upstream are eventually picked up.
+        self.llm_cache = LLMCache(db, max_age_seconds=7 * 24 * 60 * 60)
+        # Regulations store only their XML URL; text is fetched when a stored regulation is analyzed.
+        self._cached_regulation_text = functools.lru_cache(maxsize=1024)(self._fetch_regulation_text)
         self.prompt_strategies = self._load_prompt_strategies()
-        self.agencies = self._get_all_agencies()
 
     def _load_prompt_strategies(self) -> Dict[str, List[str]]:
         """Loads prompt strategies from a JSON file."""
@@ -63,14 +117,18 @@ class IngestionManager:
                 ]
             }
 
+    @functools.cached_property
+    def agencies(self) -> List[Dict[str, str]]:
+        """All Federal Register agencies, fetched on first use rather than whenever a manager is built."""
+        return self._get_all_agencies()
+
     def _get_all_agencies(self) -> List[Dict[str, str]]:
         """Fetches a list of all agencies from the Federal Register API."""
         agencies_url = "https://www.federalregister.gov/api/v1/agencies"
         try:
             logger.info("Fetching list of all available agencies...")
-            response = requests.get(agencies_url, timeout=self.request_timeout)
-            response.raise_for_status()
-            agencies_data = response.json()
+            response = self._get(agencies_url)
+            agencies_data = orjson.loads(response.content)
             # Sort them alphabetically by name for the dropdown
             sorted_agencies = sorted(agencies_data, key=lambda x: x.get('name', ''))
             logger.info(f"Successfully fetched {len(sorted_agencies)} agencies.")
@@ -148,153 +206,273 @@ Instructions:
                 "bullet_summary": ["Failed to generate summary."]
             }
 
-    @backoff.on_exception(backoff.expo, requests.exceptions.RequestException, max_tries=3)
-    def fetch_federal_register_data(self, start_date: str = "2025-07-01", end_date: str = "2025-07-31",
-                                    agency: str = None) -> List[Dict[str, Any]]:
-        """Fetch Federal Register documents published within the date range."""
+    def iter_federal_register_documents(self, start_date: str = "2025-07-01", end_date: str = "2025-07-31",
+                                        agency: str = None, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yields Federal Register documents published within the date range, one API page at a time, stopping
+        after limit documents. The next page is only requested while the current one cannot cover the limit.
+        """
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
+        params = {
+            "fields[]": ["title", "full_text_xml_url", "agencies", "publication_date", "document_number"],
+            "per_page": 1000,
+            "publication_date_gte": start_date,
+            "publication_date_lte": end_date,
+            "order": "newest"
+        }
+        if self.api_key and self.api_key != "your_federal_register_api_key":
+            params["api_key"] = self.api_key
+        if agency:
+            params["conditions[agencies][]"] = agency
+
+        logger.debug(f"API query parameters: {params}")
+
+        def in_range(doc: Dict[str, Any]) -> bool:
+            try:
+                return start_dt <= datetime.strptime(doc.get("publication_date", ""), "%Y-%m-%d").date() <= end_dt
+            except ValueError:
+                return False
+
+        remaining = limit
+        if remaining == 0:
+            return
+        page = 1
+        # Request the next page while the current one is being consumed. Closing the generator early must not
+        # wait on a download nobody will read, so the executor is shut down without waiting.
+        executor = ThreadPoolExecutor(max_workers=1)
         try:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
-            params = {
-                "fields[]": ["title", "full_text_xml_url", "agencies", "publication_date", "document_number"],
-                "per_page": 1000,
-                "publication_date_gte": start_date,
-                "publication_date_lte": end_date,
-                "order": "newest"
-            }
-            if self.api_key and self.api_key != "your_federal_register_api_key":
-                params["api_key"] = self.api_key
-            if agency:
-                params["conditions[agencies][]"] = agency
-
-            logger.debug(f"API query parameters: {params}")
-            all_documents = []
-            page = 1
-            while True:
-                params["page"] = page
-                encoded_params = urllib.parse.urlencode(params, doseq=True)
-                response = requests.get(f"{self.base_url}?{encoded_params}", timeout=self.request_timeout)
-                response_data = response.json()
-                logger.debug(
-                    f"API response page {page} metadata: total_count={response_data.get('total_count', 'unknown')}, next_page_url={response_data.get('next_page_url', 'none')}")
-                response.raise_for_status()
-                documents = response_data.get("results", [])
-
-                valid_documents = []
-                for doc in documents:
-                    doc_date = doc.get("publication_date", "")
-                    try:
-                        doc_dt = datetime.strptime(doc_date, "%Y-%m-%d").date()
-                        if not (start_dt <= doc_dt <= end_dt):
-                            continue
-                    except ValueError:
-                        continue
-                    valid_documents.append(doc)
-
-                all_documents.extend(valid_documents)
-
-                if not response_data.get("next_page_url") or not documents:
-                    break
-                page += 1
+            next_page = executor.submit(self._fetch_documents_page, params, page)
+            while next_page is not None:
+                response_data = next_page.result()
+                documents = [doc for doc in response_data.get("results", []) if in_range(doc)]
+                if remaining is not None:
+                    documents = documents[:remaining]
+                    remaining -= len(documents)
+                next_page = None
+                if response_data.get("next_page_url") and response_data.get("results") and remaining != 0:
+                    page += 1
+                    next_page = executor.submit(self._fetch_documents_page, params, page)
+                yield from documents
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
+    def fetch_federal_register_data(self, start_date: str = "2025-07-01", end_date: str = "2025-07-31",
+                                    agency: str = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Fetch Federal Register documents published within the date range, stopping after limit documents."""
+        try:
+            all_documents = list(self.iter_federal_register_documents(start_date, end_date, agency, limit=limit))
             logger.info(
                 f"Fetched {len(all_documents)} documents from Federal Register for {start_date} to {end_date}" + (
                     f" for agency: {agency}" if agency else ""))
             return all_documents
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
             logger.error(f"Error fetching Federal Register data: {str(e)}")
             return []
 
+    @backoff.on_exception(backoff.expo, requests.exceptions.RequestException, max_tries=3,
+                          jitter=backoff.full_jitter, giveup=_is_permanent_request_error)
+    def _get(self, url: str) -> requests.Response:
+        """GET a Federal Register URL through the shared session, rate limited and retried on transient errors."""
+        self.rate_limiter.wait()
+        response = self.session.get(url, timeout=self.request_timeout)
+        response.raise_for_status()
+        return response
+
+    def _fetch_documents_page(self, params: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """Fetches one page of document search results."""
+        encoded_params = urllib.parse.urlencode({**params, "page": page}, doseq=True)
+        response_data = orjson.loads(self._get(f"{self.base_url}?{encoded_params}").content)
+        logger.debug(
+            f"API response page {page} metadata: total_count={response_data.get('total_count', 'unknown')}, next_page_url={response_data.get('next_page_url', 'none')}")
+        return response_data
+
     def parse_xml_content(self, xml_url: str) -> str:
         """Parse XML content from a given URL."""
         try:
             logger.debug(f"Fetching XML from {xml_url}")
-            response = requests.get(xml_url, timeout=self.request_timeout)
-            response.raise_for_status()
-            root = ET.fromstring(response.content)
-            text = " ".join(root.itertext()).strip()
+            response = self._get(xml_url)
+            text = self._extract_xml_text(response.content, max_chars=4000)
             if not text:
                 logger.warning(f"No text extracted from XML at {xml_url}")
-            else:
-                text = text[:4000]
             return text
-        except (requests.RequestException, ET.ParseError) as e:
+        except (requests.RequestException, expat.ExpatError) as e:
             logger.error(f"Error processing XML from {xml_url}: {str(e)}")
             return ""
 
+    @staticmethod
+    def _extract_xml_text(content: bytes, max_chars: Optional[int] = None, chunk_size: int = 65536) -> str:
+        """
+        Streams the character data out of an XML document without building an element tree.
+        Produces the same string as " ".join(root.itertext()).strip()[:max_chars], but stops
+        parsing as soon as the first max_chars characters are settled.
+        """
+        parts = []
+        pending_text = []
+        seen_chars = 0
+
+        def end_text_node(*_):
+            # Called at every tag, so each element's text and each tail becomes its own part.
+            nonlocal seen_chars
+            if pending_text:
+                part = "".join(pending_text)
+                pending_text.clear()
+                parts.append(part)
+                seen_chars += len(part) + 1
+
+        parser = expat.ParserCreate()
+        parser.CharacterDataHandler = pending_text.append
+        parser.StartElementHandler = end_text_node
+        parser.EndElementHandler = end_text_node
+        for start in range(0, len(content), chunk_size):
+            parser.Parse(content[start:start + chunk_size], False)
+            if max_chars is not None and seen_chars > max_chars:
+                text = " ".join(parts).lstrip()
+                # Once non-whitespace follows the cut-off, the rest of the document can't change the result.
+                if text[max_chars:].strip():
+                    return text[:max_chars]
+        parser.Parse(b"", True)
+        end_text_node()
+        return " ".join(parts).strip()[:max_chars]
+
+    def iter_xml_texts(self, docs: List[Dict[str, Any]]):
+        """Yields the parsed text of each document in order, downloading up to xml_download_workers ahead."""
+        urls = [doc.get("full_text_xml_url", "") for doc in docs]
+        window = self.xml_download_workers
+        executor = ThreadPoolExecutor(max_workers=window)
+        try:
+            pending = deque(executor.submit(self.parse_xml_content, url) for url in urls[:window])
+            for url in urls[window:]:
+                future = pending.popleft()
+                pending.append(executor.submit(self.parse_xml_content, url))
+                yield future.result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Don't wait on prefetched documents if the caller stops early (e.g. LLM limit reached).
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def ingest_regulation(self, reg_data: Dict[str, Any]) -> bool:
         """Store regulation data in the database."""
+        return self.ingest_regulations_bulk([reg_data])
+
+    def ingest_regulations_bulk(self, reg_datas: List[Dict[str, Any]]) -> bool:
+        """Store several regulations in the database in a single transaction."""
+        if not reg_datas:
+            return True
         try:
             query = """
-                INSERT OR IGNORE INTO regulations (reg_number, title, text, effective_date, agency)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT OR IGNORE INTO regulations (reg_number, title, text, full_text_xml_url, effective_date, agency)
+                VALUES (?, ?, ?, ?, ?, ?)
             """
-            params = (
+            rows = [(
                 reg_data.get("document_number", ""),
                 reg_data.get("title", ""),
-                reg_data.get("text", ""),
+                reg_data.get("text"),
+                reg_data.get("full_text_xml_url"),
                 reg_data.get("publication_date", ""),
                 reg_data.get("agency", "")
-            )
-            self.db.execute_query(query, params)
+            ) for reg_data in reg_datas]
+            self.db.execute_many(query, rows)
             return True
         except Exception as e:
-            logger.error(f"Error ingesting regulation {reg_data.get('document_number', 'unknown')}: {str(e)}")
+            doc_numbers = ", ".join(reg_data.get("document_number", "unknown") for reg_data in reg_datas)
+            logger.error(f"Error ingesting regulations {doc_numbers}: {str(e)}")
             return False
 
+    def _fetch_regulation_text(self, xml_url: str) -> str:
+        """Downloads a regulation's text; raises instead of returning "" so failures aren't cached."""
+        text = self.parse_xml_content(xml_url)
+        if not text:
+            raise ValueError(f"Could not retrieve regulation text from {xml_url}")
+        return text
+
     def chunk_by_agency(self, documents: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """Organize documents by agency."""
-        agency_chunks = {}
+        agency_chunks = defaultdict(list)
         for doc in documents:
-            display_agency = doc.get("agencies", [{}])[0].get("name", "Unknown")
-            if display_agency not in agency_chunks:
-                agency_chunks[display_agency] = []
-            agency_chunks[display_agency].append(doc)
-        return agency_chunks
-
-    def analyze_regulation(self, reg_id: int, prompt_strategy_name: str = "DOGE Criteria") -> Dict[str, Any]:
-        """Analyze a single regulation by ID using a specified prompt strategy."""
+            agencies = doc.get("agencies") or [{}]
+            agency_chunks[agencies[0].get("name") or "Unknown"].append(doc)
+        return dict(agency_chunks)
+
+    @staticmethod
+    def _build_messages(prompt_template: str, text: str) -> List[Dict[str, str]]:
+        """
+        Sends a template's fixed instruction as the system message and the regulation text as the user
+        message, so every call with the same template starts with an identical, provider-cacheable prefix.
+        Templates that don't end with {text} are formatted into a single user message as before.
+        """
+        instruction, placeholder, rest = prompt_template.rpartition("{text}")
+        if placeholder and not rest.strip() and "{text}" not in instruction:
+            instruction = instruction.replace("{{", "{").replace("}}", "}").strip()
+            return [{"role": "system", "content": instruction}, {"role": "user", "content": text}]
+        return [{"role": "user", "content": prompt_template.format(text=text)}]
+
+    def _run_prompts(self, prompts: List[str], text: str, model_name: str,
+                     use_cache: bool = True) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Runs each prompt template against the text, serving repeated prompts from the LLM cache unless use_cache
+        is False, in which case every prompt is sent and its cached response refreshed.
+        Returns one analysis entry per template, in template order, and the number of model calls made.
+        """
+        prompt_messages = [self._build_messages(prompt_template, text) for prompt_template in prompts]
+        cache_keys = [LLMCache.make_key(model_name, json.dumps(messages)) for messages in prompt_messages]
+        result_texts = self.llm_cache.get_many(cache_keys) if use_cache else [None] * len(prompts)
+
+        pending = [i for i, cached in enumerate(result_texts) if cached is None]
+        if len(pending) < len(prompts):
+            logger.info(f"Served {len(prompts) - len(pending)} of {len(prompts)} prompts from the LLM cache.")
+
+        if pending:
+            def call(i: int) -> Dict[str, Any]:
+                return llm_caller.call_model_with_prompt(
+                    model_name=model_name,
+                    prompt_config={"messages": prompt_messages[i]},
+                    response_format_type="text"
+                )
+
+            # The prompts are independent, so issue them concurrently rather than one after another.
+            if len(pending) == 1:
+                responses = [call(pending[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(len(pending), self.prompt_workers)) as executor:
+                    responses = list(executor.map(call, pending))
+            for i, response in zip(pending, responses):
+                parsed_content = response.get("parsed_content")
+                if isinstance(parsed_content, dict) and "error" in parsed_content:
+                    result_texts[i] = f"Error: {parsed_content.get('error')}"
+                elif parsed_content is None:
+                    result_texts[i] = "Error: No response received."
+                else:
+                    result_texts[i] = parsed_content
+                    if isinstance(parsed_content, str):
+                        self.llm_cache.set(cache_keys[i], parsed_content)
+
+        return [
+            {"prompt": prompt_template.split("\n")[0], "result": result_texts[i]}
+            for i, prompt_template in enumerate(prompts)
+        ], len(pending)
+
+    def analyze_regulation(self, reg_id: int, prompt_strategy_name: str = "DOGE Criteria",
+                           use_cache: bool = True) -> Dict[str, Any]:
+        """Analyze a single regulation by ID using a specified prompt strategy; use_cache=False re-runs every prompt."""
         try:
-            query = "SELECT text FROM regulations WHERE id = ?"
+            query = "SELECT text, full_text_xml_url FROM regulations WHERE id = ?"
             result = self.db.execute_query(query, (reg_id,))
             if not result:
                 return {"error": "Regulation not found"}
 
-            reg_text = result[0][0]
+            reg_text, xml_url = result[0]
+            if not reg_text:
+                if not xml_url:
+                    return {"error": "Regulation has no stored text or XML URL"}
+                reg_text = self._cached_regulation_text(xml_url)
             prompts = self.prompt_strategies.get(prompt_strategy_name)
             if not prompts:
                 return {"error": f"Prompt strategy '{prompt_strategy_name}' not found."}
 
-            model_name = "gemini/gemini-2.5-flash"
-
-            prompt_configs = []
-            for i, prompt_template in enumerate(prompts):
-                prompt = prompt_template.format(text=reg_text[:4000])
-                prompt_configs.append({
-                    "key": f"prompt_{i}",
-                    "prompt_config": {"messages": [{"role": "user", "content": prompt}]}
-                })
-
-            responses = llm_caller.get_responses_from_multiple_models(
-                prompt_configs=prompt_configs, models=[model_name], response_format_type="text"
-            )
-
-            analysis_results = []
-            model_responses = responses.get(model_name, [])
-            for i, prompt_template in enumerate(prompts):
-                prompt_key = f"prompt_{i}"
-                response_item = next((r for r in model_responses if r.get('prompt_key') == prompt_key), None)
-                result_text = "Error: No response received."
-                if response_item:
-                    parsed_content = response_item.get("parsed_content")
-                    if isinstance(parsed_content, dict) and "error" in parsed_content:
-                        result_text = f"Error: {parsed_content.get('error')}"
-                    else:
-                        result_text = parsed_content
-                analysis_results.append({
-                    "prompt": prompt_template.split("\n")[0],
-                    "result": result_text
-                })
+            analysis_results, _ = self._run_prompts(prompts, reg_text[:4000], "gemini/gemini-2.5-flash",
+                                                    use_cache=use_cache)
 
             # Perform meta-analysis on the results
             meta_analysis_result = self._get_meta_analysis(reg_text, analysis_results)
@@ -310,79 +488,58 @@ Instructions:
             return {"error": str(e)}
 
     def analyze_chunk(self, chunk: List[Dict[str, Any]], agency: str, prompts: List[str], prompt_strategy_name: str,
-                      progress_callback=None, start_index=0, total_docs=0) -> List[Dict[str, Any]]:
-        """Analyze a chunk of documents with a given list of prompts."""
+                      progress_callback=None, start_index=0, total_docs=0,
+                      texts: Optional[Iterator[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Analyze a chunk of documents with a given list of prompts. texts, if given, yields each document's
+        parsed XML text in chunk order; otherwise the chunk's XML is downloaded here.
+        """
         results = []
+        reg_datas = []
         model_name = "gemini/gemini-2.5-flash"
 
-        for i, doc in enumerate(chunk):
-            if self.llm_call_limit is not None and self.llm_calls_made >= self.llm_call_limit:
-                logger.warning(f"LLM call limit ({self.llm_call_limit}) reached. Halting analysis for this chunk.")
-                break
+        if texts is None:
+            texts = self.iter_xml_texts(chunk)
+        try:
+            for i, (doc, text) in enumerate(zip(chunk, texts)):
+                if self.llm_call_limit is not None and self.llm_calls_made >= self.llm_call_limit:
+                    logger.warning(f"LLM call limit ({self.llm_call_limit}) reached. Halting analysis for this chunk.")
+                    break
 
-            current_index = start_index + i
-            doc_id = doc.get("document_number", "unknown")
+                current_index = start_index + i
+                doc_id = doc.get("document_number", "unknown")
 
-            if progress_callback:
-                message = f"Analyzing document {current_index + 1}/{total_docs} ({doc_id})..."
-                progress_callback(current_index + 1, total_docs, message)
-
-            text = self.parse_xml_content(doc.get("full_text_xml_url", ""))
-            if not text.strip():
-                logger.warning(f"Skipping document {doc_id} due to empty text")
-                continue
-
-            # Step 1: Get individual prompt responses
-            prompt_configs_for_doc = []
-            for j, prompt_template in enumerate(prompts):
-                prompt = prompt_template.format(text=text)
-                prompt_configs_for_doc.append({
-                    "key": f"prompt_{j}",
-                    "prompt_config": {"messages": [{"role": "user", "content": prompt}]}
-                })
+                if progress_callback:
+                    message = f"Analyzing document {current_index + 1}/{total_docs} ({doc_id})..."
+                    progress_callback(current_index + 1, total_docs, message)
 
-            responses = llm_caller.get_responses_from_multiple_models(
-                prompt_configs=prompt_configs_for_doc, models=[model_name], response_format_type="text"
-            )
-            self.llm_calls_made += len(prompt_configs_for_doc)
-
-            analysis_results = []
-            model_responses = responses.get(model_name, [])
-            for j, prompt_template in enumerate(prompts):
-                prompt_key = f"prompt_{j}"
-                response_item = next((r for r in model_responses if r.get('prompt_key') == prompt_key), None)
-                result_text = "Error: No response received."
-                if response_item:
-                    parsed_content = response_item.get("parsed_content")
-                    if isinstance(parsed_content, dict) and "error" in parsed_content:
-                        result_text = f"Error: {parsed_content.get('error')}"
-                    else:
-                        result_text = parsed_content
-                analysis_results.append({
-                    "prompt": prompt_template.split("\n")[0],
-                    "result": result_text
-                })
+                if not text.strip():
+                    logger.warning(f"Skipping document {doc_id} due to empty text")
+                    continue
 
-            # Step 2: Perform meta-analysis on the results
-            if self.llm_call_limit is not None and self.llm_calls_made >= self.llm_call_limit:
-                meta_analysis_result = {
-                    "recommended_action": "limit_reached",
-                    "goal_alignment": "limit_reached",
-                    "bullet_summary": ["LLM limit reached before meta-analysis."]
-                }
-            else:
-                meta_analysis_result = self._get_meta_analysis(text, analysis_results)
-                self.llm_calls_made += 1  # Account for the meta-analysis call
-
-            # Step 3: Store everything
-            reg_data = {
-                "document_number": doc_id,
-                "title": doc.get("title", ""),
-                "text": text,
-                "publication_date": doc.get("publication_date", ""),
-                "agency": agency
-            }
-            if self.ingest_regulation(reg_data):
+                # Step 1: Get individual prompt responses, issued concurrently and served from the cache when repeated
+                analysis_results, calls_made = self._run_prompts(prompts, text, model_name)
+                self.llm_calls_made += calls_made  # Cache hits don't count against the limit
+
+                # Step 2: Perform meta-analysis on the results
+                if self.llm_call_limit is not None and self.llm_calls_made >= self.llm_call_limit:
+                    meta_analysis_result = {
+                        "recommended_action": "limit_reached",
+                        "goal_alignment": "limit_reached",
+                        "bullet_summary": ["LLM limit reached before meta-analysis."]
+                    }
+                else:
+                    meta_analysis_result = self._get_meta_analysis(text, analysis_results)
+                    self.llm_calls_made += 1  # Account for the meta-analysis call
+
+                # Step 3: Queue everything for storage
+                reg_datas.append({
+                    "document_number": doc_id,
+                    "title": doc.get("title", ""),
+                    "full_text_xml_url": doc.get("full_text_xml_url"),
+                    "publication_date": doc.get("publication_date", ""),
+                    "agency": agency
+                })
                 results.append({
                     "document_number": doc_id,
                     "title": doc.get("title", ""),
@@ -391,6 +548,13 @@ Instructions:
                     "analyses": analysis_results,
                     "meta_analysis": meta_analysis_result
                 })
+        finally:
+            # Step 4: Store the chunk in one transaction, including documents analyzed before an exception. If the
+            # bulk insert fails, each row is retried alone; the analyses are returned either way, and rows that
+            # still fail are recorded in unsaved_documents for the caller to report.
+            if not self.ingest_regulations_bulk(reg_datas):
+                self.unsaved_documents.extend(reg_data["document_number"] for reg_data in reg_datas
+                                              if not self.ingest_regulation(reg_data))
         return results
 
     def process_federal_register(self, start_date: str = "2025-07-01", end_date: str = "2025-07-31",
@@ -401,6 +565,9 @@ Instructions:
         """Main method to fetch, chunk, and analyze Federal Register data."""
         self.llm_calls_made = 0
         self.llm_call_limit = llm_call_limit
+        self.unsaved_documents = []
+        # Once per run rather than per lookup: expired entries are already ignored by get_many.
+        self.llm_cache.purge_expired()
 
         prompts = self.prompt_strategies.get(prompt_strategy_name)
         if not prompts:
@@ -408,14 +575,14 @@ Instructions:
         logger.info(f"Using prompt strategy: {prompt_strategy_name}")
 
         try:
-            documents = self.fetch_federal_register_data(start_date, end_date, agency)
+            limit = doc_limit if doc_limit is not None and doc_limit > 0 else None
+            if limit:
+                logger.info(f"Limiting processing to the first {limit} matching documents.")
+            # With a limit, stop paging through the API as soon as enough documents have been seen.
+            documents = self.fetch_federal_register_data(start_date, end_date, agency, limit=limit)
             if not documents:
                 return {"status": "error", "message": "No documents fetched"}
 
-            if doc_limit is not None and doc_limit > 0:
-                logger.info(f"Limiting processing to the first {doc_limit} of {len(documents)} fetched documents.")
-                documents = documents[:doc_limit]
-
             total_docs = len(documents)
             if progress_callback:
                 progress_callback(0, total_docs, f"Fetched {total_docs} documents. Starting analysis...")
@@ -427,22 +594,27 @@ Instructions:
 
             all_results = []
             processed_docs_count = 0
-            for chunk_agency, chunk in agency_chunks.items():
-                logger.info(f"Processing {len(chunk)} documents for agency: {chunk_agency}")
-                results = self.analyze_chunk(chunk, chunk_agency, prompts, prompt_strategy_name,
-                                             progress_callback, processed_docs_count,
-                                             total_docs)
-                all_results.extend(results)
-                processed_docs_count += len(results)
-
-                # Check if the limit was hit and stop processing more chunks
-                if self.llm_call_limit is not None and self.llm_calls_made >= self.llm_call_limit:
-                    logger.warning(f"LLM call limit ({self.llm_call_limit}) reached. Halting further processing.")
-                    break
+            # One download stream across all chunks, so the next agency's XML is fetched while this one is analyzed.
+            texts = self.iter_xml_texts([doc for chunk in agency_chunks.values() for doc in chunk])
+            try:
+                for chunk_agency, chunk in agency_chunks.items():
+                    logger.info(f"Processing {len(chunk)} documents for agency: {chunk_agency}")
+                    results = self.analyze_chunk(chunk, chunk_agency, prompts, prompt_strategy_name,
+                                                 progress_callback, processed_docs_count,
+                                                 total_docs, texts=texts)
+                    all_results.extend(results)
+                    processed_docs_count += len(results)
+
+                    # Check if the limit was hit and stop processing more chunks
+                    if self.llm_call_limit is not None and self.llm_calls_made >= self.llm_call_limit:
+                        logger.warning(f"LLM call limit ({self.llm_call_limit}) reached. Halting further processing.")
+                        break
+            finally:
+                texts.close()
 
             if progress_callback:
                 progress_callback(total_docs, total_docs, "Ingestion complete!")
-            return {"status": "success", "results": all_results}
+            return {"status": "success", "results": all_results, "unsaved_documents": list(self.unsaved_documents)}
         except Exception as e:
             logger.error(f"Error processing Federal Register data: {str(e)}", exc_info=True)
             return {"status": "error", "message": str(e)}
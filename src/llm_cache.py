@@ -0,0 +1,73 @@
+import hashlib
+import json
+import logging
+import time
+from typing import List, Optional
+
+from src.database import Database
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """
+    Stores LLM responses in SQLite, keyed by a hash of the model and the full prompt. The llm_cache table is
+    created by init.py, or at app startup by Database.upgrade_schema for older databases.
+    """
+
+    def __init__(self, db: Database, max_age_seconds: Optional[int] = None):
+        self.db = db
+        self.max_age_seconds = max_age_seconds
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str) -> str:
+        payload = json.dumps({"model": model_name, "prompt": prompt}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached response for key, or None on a miss or an expired entry."""
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """Looks up several keys in one query, returning responses (or None) in key order."""
+        if not keys:
+            return []
+        placeholders = ", ".join("?" * len(keys))
+        try:
+            rows = self.db.execute_query(
+                f"SELECT key, response, created_at FROM llm_cache WHERE key IN ({placeholders})", tuple(keys)
+            )
+        except Exception as e:
+            logger.error(f"LLM cache lookup failed: {e}")
+            return [None] * len(keys)
+        now = time.time()
+        found = {
+            key: response for key, response, created_at in rows
+            if self.max_age_seconds is None or now - created_at <= self.max_age_seconds
+        }
+        return [found.get(key) for key in keys]
+
+    def set(self, key: str, response: str) -> None:
+        try:
+            self.db.execute_query(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, time.time())
+            )
+        except Exception as e:
+            logger.error(f"LLM cache write failed: {e}")
+
+    def purge_expired(self) -> int:
+        """Deletes entries older than max_age_seconds, returning how many were removed."""
+        if self.max_age_seconds is None:
+            return 0
+        try:
+            with self.db.get_connection() as conn:
+                removed = conn.execute("DELETE FROM llm_cache WHERE created_at < ?",
+                                       (time.time() - self.max_age_seconds,)).rowcount
+                conn.commit()
+        except Exception as e:
+            logger.error(f"LLM cache purge failed: {e}")
+            return 0
+        if removed:
+            logger.info(f"Purged {removed} expired LLM cache entries.")
+        return removed
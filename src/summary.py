@@ -0,0 +1,113 @@
+import streamlit as st
+import pandas as pd
+import logging
+import orjson
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+# Shared by the Review Summary and Public Results pages, so both use one set of cache entries.
+logger = logging.getLogger(__name__)
+
+
+def _scan_results(output_dir: Path) -> List[Tuple[Path, os.stat_result]]:
+    # One directory pass shared by the listing and the fingerprint. DirEntry.stat() still costs a syscall per
+    # file on Linux; a missing directory simply has no results.
+    try:
+        with os.scandir(output_dir) as entries:
+            return [(Path(entry.path), entry.stat()) for entry in entries
+                    if entry.name.startswith("analysis_results_") and entry.name.endswith(".json")]
+    except FileNotFoundError:
+        return []
+
+
+def list_results_files(output_dir: Path) -> List[Path]:
+    # Newest first.
+    scanned = sorted(_scan_results(output_dir), key=lambda item: item[1].st_mtime_ns, reverse=True)
+    return [path for path, _ in scanned]
+
+
+def results_fingerprint(output_dir: Path) -> tuple:
+    # Name, mtime and size of every results file: any added, removed or rewritten file changes the key.
+    return tuple(sorted((path.name, stat.st_mtime_ns, stat.st_size) for path, stat in _scan_results(output_dir)))
+
+
+def read_results_file(file_path: Path):
+    try:
+        return orjson.loads(file_path.read_bytes())
+    except Exception as e:
+        logger.error(f"Could not read file {file_path}: {e}")
+        return None
+
+
+# cache_resource hands back the cached DataFrame itself rather than a copy on every rerun; the pages only
+# read it. The fingerprint argument makes a new or removed results file load fresh data.
+@st.cache_resource(ttl=300)
+def load_all_results(output_dir: Path, fingerprint: tuple) -> Tuple[pd.DataFrame, int]:
+    if not output_dir.exists():
+        logger.warning(f"Output directory does not exist: {output_dir}")
+        return pd.DataFrame(), 0
+    frames = []
+    total_results = 0
+    seen = set()
+    result_files = list_results_files(output_dir)
+    # Rows are listed newest file first and the last occurrence of a document wins, so walk oldest file
+    # first and each file bottom-up, keeping the first occurrence: duplicates never enter the DataFrame.
+    # Files are read and parsed on a thread pool; map() still yields them oldest first for the walk below.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        payloads = list(executor.map(read_results_file, reversed(result_files)))
+    for file_path, records in zip(reversed(result_files), payloads):
+        if records is None:
+            continue
+        try:
+            kept = []
+            for record in reversed(records):
+                document_number = record.get('document_number')
+                if document_number not in seen:
+                    seen.add(document_number)
+                    kept.append(record)
+            total_results += len(records)
+        except Exception as e:
+            logger.error(f"Could not read file {file_path}: {e}")
+            continue
+        if kept:
+            kept.reverse()
+            frames.append(pd.DataFrame(kept))
+    frames.reverse()
+    unique_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return unique_df, total_results
+
+
+def create_summary_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return pd.DataFrame()
+
+    # Pull whole columns out once instead of building a Series per row with iterrows().
+    def column(name, default=None):
+        return df[name].tolist() if name in df.columns else [default] * len(df)
+
+    metas = [m if isinstance(m, dict) else {} for m in column('meta_analysis', {})]
+    summaries = []
+    for meta_analysis in metas:
+        bullet_summary_list = meta_analysis.get('bullet_summary', [])
+        if isinstance(bullet_summary_list, list):
+            summaries.append("\n".join(f"- {item}" for item in bullet_summary_list))
+        else:
+            summaries.append("Summary not available.")
+    return pd.DataFrame({
+        'document_number': column('document_number'),
+        'title': column('title'),
+        'agency': column('agency'),
+        'Strategy': column('prompt_strategy_name', 'Unknown'),
+        'Recommended Action': [m.get('recommended_action', 'N/A') for m in metas],
+        'Goal Alignment': [m.get('goal_alignment', 'N/A') for m in metas],
+        'Summary': summaries
+    })
+
+
+# Built once per results fingerprint alongside load_all_results, so reruns skip the summary build as well.
+@st.cache_resource(ttl=300)
+def load_summary(output_dir: Path, fingerprint: tuple) -> pd.DataFrame:
+    unique_df, _ = load_all_results(output_dir, fingerprint)
+    return create_summary_dataframe(unique_df)